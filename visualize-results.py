@@ -1,9 +1,14 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
+import matplotlib
+# Use the non-interactive Agg backend; figures are only ever written to disk
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.lines import Line2D
 import matplotlib.ticker as ticker
 from mpl_toolkits.mplot3d import Axes3D
 
@@ -13,6 +18,13 @@ sns.set_style("whitegrid")
 sns.set_context("paper", font_scale=1.5)
 plt.rcParams['figure.figsize'] = [12, 8]
 
+# Simplify line paths and render them in chunks to speed up rasterization
+plt.rcParams.update({
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+})
+
 # Colors
 COLORS = {
     'primary': '#1f77b4',    # Blue
@@ -36,47 +48,199 @@ OUTPUT_DIR = 'visualizations'
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
 
+# Output resolution (set MPL_DPI=300 for paper-ready figures)
+DPI = int(os.environ.get('MPL_DPI', 150))
+
+# Fast, lightly compressed PNG encoding
+PNG_PIL_KWARGS = {'compress_level': 1, 'optimize': False}
+
+# Column dtypes for the experiment CSVs (columns missing from a file are ignored)
+CSV_DTYPES = {
+    'nodeNum': 'int32',
+    'byzantinePercentage': 'int8',
+    'meanTime': 'float32',
+    'stdTime': 'float32',
+    'medianTime': 'float32',
+    'meanMsgCount': 'float32',
+    'stdMsgCount': 'float32',
+}
+
+# Integer columns narrowed further to the smallest type that fits the loaded values
+DOWNCAST_INT_COLUMNS = ['nodeNum', 'byzantineNodeNum']
+
 # Load data from CSV files
 def load_data(filename):
     filepath = os.path.join(RESULTS_DIR, filename)
     if not os.path.exists(filepath):
         print(f"Warning: File not found: {filepath}")
         return None
-    return pd.read_csv(filepath)
+    data = pd.read_csv(filepath, dtype=CSV_DTYPES, engine='c')
+    
+    for column in DOWNCAST_INT_COLUMNS:
+        if column in data.columns:
+            data[column] = pd.to_numeric(data[column], downcast='integer')
+    
+    # Store the network profile names as categorical codes for cheaper filtering and grouping
+    if 'networkProfile' in data.columns:
+        data['networkProfile'] = data['networkProfile'].astype('category')
+    
+    return data
+
+# Load all-experiments.csv once, with failed experiments filtered out
+def load_all_experiments():
+    all_data = load_data('all-experiments.csv')
+    if all_data is None:
+        return None
+    
+    # Filter out failed experiments
+    if 'failure' in all_data.columns:
+        all_data = all_data[~all_data['failure'].fillna(False)]
+    
+    return all_data
+
+# Aggregate the experiment rows to one row per (network profile, node count, Byzantine percentage)
+# configuration; computed once and shared by every combined visualization
+def aggregate_experiments(all_data):
+    aggregations = {
+        'meanTime': ('meanTime', 'mean'),
+        'stdTime': ('stdTime', 'mean'),
+    }
+    for column in ('networkMean', 'networkStd'):
+        if column in all_data.columns:
+            aggregations[column] = (column, 'first')
+    
+    return (all_data
+            .groupby(['networkProfile', 'nodeNum', 'byzantinePercentage'], observed=True, sort=True)
+            .agg(**aggregations)
+            .reset_index())
+
+# Mean consensus time table indexed by (network profile, node count), one column per Byzantine percentage
+def pivot_mean_time(summary):
+    return summary.set_index(['networkProfile', 'nodeNum', 'byzantinePercentage'])['meanTime'].unstack('byzantinePercentage')
+
+# Sort rows by (profile code, percentage, node count) and find the [start, end) bounds of each
+# (profile, percentage) group with a single linear scan over the sorted keys
+def sort_and_group_rows(profile_codes, percentages, node_nums):
+    order = np.lexsort((node_nums, percentages, profile_codes))
+    order = order[profile_codes[order] >= 0]  # Drop rows with a missing profile
+    
+    sorted_profiles = profile_codes[order]
+    sorted_percentages = percentages[order]
+    boundaries = np.flatnonzero((np.diff(sorted_profiles) != 0) | (np.diff(sorted_percentages) != 0)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(order)]))
+    
+    return order, starts, ends
+
+# Group experiment rows by (network profile, Byzantine percentage), each group sorted by node count
+def group_by_profile_and_percentage(all_data):
+    if len(all_data) == 0:
+        return
+    
+    profiles = pd.Categorical(all_data['networkProfile'])
+    percentages = all_data['byzantinePercentage'].to_numpy()
+    order, starts, ends = sort_and_group_rows(profiles.codes, percentages, all_data['nodeNum'].to_numpy())
+    
+    sorted_data = all_data.iloc[order]
+    for start, end in zip(starts, ends):
+        row = order[start]
+        yield (profiles.categories[profiles.codes[row]], percentages[row]), sorted_data.iloc[start:end]
+
+# Plot one line per Byzantine percentage, with all error bars drawn as shared collections
+def plot_byzantine_series(ax, data, byzantine_percentages, label_series=True, capsize=5):
+    # Work on raw numpy arrays, skipping rows without a mean time
+    mean_arr = data['meanTime'].to_numpy()
+    valid = np.isfinite(mean_arr)
+    if not valid.any():
+        return
+    node_arr = data['nodeNum'].to_numpy()[valid]
+    pct_arr = data['byzantinePercentage'].to_numpy()[valid]
+    mean_arr = mean_arr[valid]
+    std_arr = data['stdTime'].to_numpy()[valid]
+    
+    # Sort rows by (percentage, node count) and find each percentage's contiguous slice
+    order = np.lexsort((node_arr, pct_arr))
+    node_arr, pct_arr, mean_arr, std_arr = node_arr[order], pct_arr[order], mean_arr[order], std_arr[order]
+    percentages = np.unique(pct_arr)
+    starts = np.searchsorted(pct_arr, percentages, side='left')
+    ends = np.searchsorted(pct_arr, percentages, side='right')
+    
+    # Draw each series through its own rows only
+    markers = ['o', 's', '^', 'D', 'v', 'p', '*']
+    percentage_index = {percentage: j for j, percentage in enumerate(byzantine_percentages)}
+    lines = []
+    for percentage, start, end in zip(percentages, starts, ends):
+        line, = ax.plot(
+            node_arr[start:end],
+            mean_arr[start:end],
+            marker=markers[percentage_index[percentage] % len(markers)],
+            markersize=8,
+            linewidth=2,
+            label=f"Byzantine nodes: {percentage}%" if label_series else None
+        )
+        lines.append(line)
+    
+    # Give each sorted row its series' line color, then drop rows without a std
+    colors = np.repeat([line.get_color() for line in lines], ends - starts)
+    has_err = np.isfinite(std_arr)
+    x, y, err, colors = node_arr[has_err], mean_arr[has_err], std_arr[has_err], colors[has_err]
+    
+    # Error bars and caps as one LineCollection and one scatter
+    ax.vlines(x, y - err, y + err, colors=colors, linewidth=2)
+    ax.scatter(np.concatenate([x, x]), np.concatenate([y - err, y + err]),
+               marker='_', s=(2 * capsize) ** 2, c=np.concatenate([colors, colors]),
+               linewidths=plt.rcParams['lines.markeredgewidth'])
 
 # Generate plots for each network profile
-def create_byzantine_impact_plots():
+def create_byzantine_impact_plots(all_data):
     print("Generating Byzantine impact plots for each network profile...")
     
     # Get each network profile data file
     data_files = [f for f in os.listdir(RESULTS_DIR) if f.endswith('.csv') and 'all-experiments' not in f]
     
     if not data_files:
-        # Try to load the all-experiments.csv instead
-        all_data = load_data('all-experiments.csv')
+        # Fall back to the all-experiments.csv data instead
         if all_data is None:
             print("No experiment data found!")
             return
         
         # Split all_data into separate profiles
         network_profiles = all_data['networkProfile'].unique()
-        for profile in network_profiles:
-            profile_data = all_data[all_data['networkProfile'] == profile]
-            
-            # Create the plot for this profile
-            plot_byzantine_impact(profile_data, f"{profile}_byzantine_impact.png")
+        tasks = [(all_data[all_data['networkProfile'] == profile], f"{profile}_byzantine_impact.png")
+                 for profile in network_profiles]
     else:
-        # Process individual network profile files
-        for file in data_files:
-            data = load_data(file)
-            if data is not None:
-                plot_name = os.path.splitext(file)[0] + "_byzantine_impact.png"
-                plot_byzantine_impact(data, plot_name)
+        # Process individual network profile files (loaded inside the workers)
+        tasks = [(file, os.path.splitext(file)[0] + "_byzantine_impact.png") for file in data_files]
+    
+    if not tasks:
+        print("No experiment data found!")
+        return
+    
+    # Each profile plot is independent, so render them in parallel worker processes
+    max_workers = min(len(tasks), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_plot_worker) as executor:
+        list(executor.map(render_byzantine_impact, tasks))
     
     print("✓ Byzantine impact plots generated")
 
+# Axes reused by every Byzantine impact plot rendered in this worker process
+worker_ax = None
+
+# Create the worker process's reusable figure
+def init_plot_worker():
+    global worker_ax
+    _, worker_ax = plt.subplots(figsize=(12, 8))
+
+# Render one Byzantine impact plot from a (data file name or DataFrame, output filename) task
+def render_byzantine_impact(task):
+    source, plot_name = task
+    data = load_data(source) if isinstance(source, str) else source
+    if data is not None:
+        plot_byzantine_impact(data, plot_name, ax=worker_ax)
+
 # Plot Byzantine node impact for a specific network profile
-def plot_byzantine_impact(data, output_filename):
+# (pass `ax` to draw onto an existing axes, which is cleared first and left open)
+def plot_byzantine_impact(data, output_filename, ax=None):
     # Filter out failed experiments
     if 'failure' in data.columns:
         data = data[~data['failure'].fillna(False)]
@@ -84,43 +248,27 @@ def plot_byzantine_impact(data, output_filename):
     # Get unique Byzantine percentages
     byzantine_percentages = sorted(data['byzantinePercentage'].unique())
     
-    # Create figure
-    fig, ax = plt.subplots(figsize=(12, 8))
+    # Create figure, or reuse the caller's axes
+    owns_figure = ax is None
+    if owns_figure:
+        fig, ax = plt.subplots(figsize=(12, 8))
+    else:
+        fig = ax.figure
+        ax.clear()
     
-    # Plot line for each Byzantine percentage
-    markers = ['o', 's', '^', 'D', 'v', 'p', '*']
-    for i, percentage in enumerate(byzantine_percentages):
-        percentage_data = data[data['byzantinePercentage'] == percentage].sort_values('nodeNum')
-        
-        # Skip if no data for this percentage
-        if len(percentage_data) == 0:
-            continue
-            
-        label = f"Byzantine nodes: {percentage}%"
-        
-        # Plot with error bars
-        ax.errorbar(
-            percentage_data['nodeNum'],
-            percentage_data['meanTime'],
-            yerr=percentage_data['stdTime'],
-            marker=markers[i % len(markers)],
-            markersize=8,
-            linewidth=2,
-            label=label,
-            capsize=5
-        )
+    # Plot line with error bars for each Byzantine percentage
+    plot_byzantine_series(ax, data, byzantine_percentages)
     
-    # Add theoretical threshold line (f = n/3)
-    # This line shows where the Byzantine percentage is 33.3% (theoretical limit)
-    x_vals = np.linspace(0, data['nodeNum'].max() * 1.1, 100)
-    y_theoretical = np.zeros_like(x_vals)
-    y_theoretical.fill(np.nan)  # Using NaN for visualization purposes
-    ax.plot(x_vals, y_theoretical, 'r--', linewidth=2, alpha=0.7, label="Theoretical BFT limit (33.3%)")
+    # Legend-only proxy for the theoretical threshold (f = n/3)
+    # This entry marks where the Byzantine percentage is 33.3% (theoretical limit)
+    threshold_proxy = Line2D([0], [0], linestyle='--', color='r', linewidth=2, alpha=0.7,
+                             label="Theoretical BFT limit (33.3%)")
     
     # Add annotation for the theoretical limit
+    annotation_xy = (float(data['nodeNum'].max()) * 0.7, float(data['meanTime'].max()) * 0.8)
     ax.annotate('Byzantine nodes > n/3\n(system vulnerable)',
-                xy=(data['nodeNum'].max() * 0.7, data['meanTime'].max() * 0.8),
-                xytext=(data['nodeNum'].max() * 0.7, data['meanTime'].max() * 0.8),
+                xy=annotation_xy,
+                xytext=annotation_xy,
                 color=COLORS['quaternary'],
                 fontsize=12,
                 bbox=dict(boxstyle="round,pad=0.5", fc="white", alpha=0.8))
@@ -138,22 +286,21 @@ def plot_byzantine_impact(data, output_filename):
     ax.grid(True, alpha=0.3)
     
     # Add legend
-    ax.legend(loc='upper left', frameon=True)
+    handles, _ = ax.get_legend_handles_labels()
+    ax.legend(handles=handles + [threshold_proxy], loc='upper left', frameon=True)
     
     # Save figure
-    plt.tight_layout()
-    plt.savefig(os.path.join(OUTPUT_DIR, output_filename), dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(os.path.join(OUTPUT_DIR, output_filename), dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_PIL_KWARGS)
+    if owns_figure:
+        plt.close(fig)
     
     print(f"  Plot saved: {output_filename}")
 
 # Create combined visualization of all network profiles
-def create_combined_visualization():
+def create_combined_visualization(all_data):
     print("Generating combined network profile visualization...")
     
-    # Load all experiment data
-    all_data = load_data('all-experiments.csv')
-    
     if all_data is None:
         # Try to load individual files and combine them
         data_files = [f for f in os.listdir(RESULTS_DIR) if f.endswith('.csv') and 'all-experiments' not in f]
@@ -161,7 +308,7 @@ def create_combined_visualization():
             print("No experiment data found!")
             return
             
-        all_data = pd.DataFrame()
+        frames = []
         for file in data_files:
             data = load_data(file)
             if data is not None:
@@ -169,11 +316,22 @@ def create_combined_visualization():
                 if 'networkProfile' not in data.columns and 'networkMean' not in data.columns:
                     profile_name = os.path.splitext(file)[0]
                     data['networkProfile'] = profile_name
-                all_data = pd.concat([all_data, data])
-    
-    # Filter out failed experiments
-    if 'failure' in all_data.columns:
-        all_data = all_data[~all_data['failure'].fillna(False)]
+                frames.append(data)
+        
+        # Concatenate all files in a single allocation
+        all_data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if all_data.empty:
+            print("No experiment data found!")
+            return
+        
+        # Per-file categories differ, so re-encode the combined profile column
+        all_data['networkProfile'] = all_data['networkProfile'].astype('category')
+        
+        # Filter out failed experiments
+        if 'failure' in all_data.columns:
+            all_data = all_data[~all_data['failure'].fillna(False)]
+        
+        all_data = aggregate_experiments(all_data)
     
     # Create a matrix of subplots for different network profiles and byzantine percentages
     network_profiles = sorted(all_data['networkProfile'].unique())
@@ -184,33 +342,21 @@ def create_combined_visualization():
     if len(network_profiles) == 1:
         axes = [axes]  # Make it iterable if there's only one profile
     
+    # Map each profile to its subplot row
+    profile_index = {profile: i for i, profile in enumerate(network_profiles)}
+    
+    # Shared y-axis limit and annotation position for all subplots
+    max_mean_time = float(all_data['meanTime'].max())
+    max_time = max_mean_time * 1.1
+    annotation_xy = (float(all_data['nodeNum'].max()) * 0.8, max_mean_time * 0.5)
+    
     # Plot each network profile on a separate subplot
-    for i, profile in enumerate(network_profiles):
+    for profile, profile_data in all_data.groupby('networkProfile', observed=True):
+        i = profile_index[profile]
         ax = axes[i]
-        profile_data = all_data[all_data['networkProfile'] == profile]
         
-        # Plot line for each Byzantine percentage within this profile
-        markers = ['o', 's', '^', 'D', 'v', 'p', '*']
-        for j, percentage in enumerate(byzantine_percentages):
-            percentage_data = profile_data[profile_data['byzantinePercentage'] == percentage].sort_values('nodeNum')
-            
-            # Skip if no data for this percentage
-            if len(percentage_data) == 0:
-                continue
-                
-            label = f"Byzantine nodes: {percentage}%"
-            
-            # Plot line with error bars
-            ax.errorbar(
-                percentage_data['nodeNum'],
-                percentage_data['meanTime'],
-                yerr=percentage_data['stdTime'],
-                marker=markers[j % len(markers)],
-                markersize=8,
-                linewidth=2,
-                label=label if i == 0 else "",  # Only label in the first subplot
-                capsize=5
-            )
+        # Plot line with error bars for each Byzantine percentage (only label in the first subplot)
+        plot_byzantine_series(ax, profile_data, byzantine_percentages, label_series=(i == 0))
         
         # Set title and labels for this subplot
         mean_delay = profile_data['networkMean'].iloc[0] if 'networkMean' in profile_data.columns else 'Unknown'
@@ -221,13 +367,12 @@ def create_combined_visualization():
         ax.grid(True, alpha=0.3)
         
         # Add y-axis limits for better comparison between plots
-        max_time = all_data['meanTime'].max() * 1.1
         ax.set_ylim(0, max_time)
         
         # Add annotation for the theoretical limit
         ax.annotate('n/3 Byzantine node threshold',
-                    xy=(all_data['nodeNum'].max() * 0.8, all_data['meanTime'].max() * 0.5),
-                    xytext=(all_data['nodeNum'].max() * 0.8, all_data['meanTime'].max() * 0.5),
+                    xy=annotation_xy,
+                    xytext=annotation_xy,
                     color=COLORS['quaternary'],
                     fontsize=10,
                     bbox=dict(boxstyle="round,pad=0.3", fc="white", alpha=0.7))
@@ -244,26 +389,19 @@ def create_combined_visualization():
     
     # Save figure
     plt.tight_layout()
-    plt.savefig(os.path.join(OUTPUT_DIR, 'combined_network_profiles.png'), dpi=300, bbox_inches='tight')
+    plt.savefig(os.path.join(OUTPUT_DIR, 'combined_network_profiles.png'), dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_PIL_KWARGS)
     plt.close()
     
     print("✓ Combined network profile visualization generated")
 
 # Create normalized scaling plot
-def create_normalized_scaling_plot():
+def create_normalized_scaling_plot(all_data):
     print("Generating normalized scaling plot...")
     
-    # Load all experiment data
-    all_data = load_data('all-experiments.csv')
-    
     if all_data is None:
         print("No experiment data found!")
         return
     
-    # Filter out failed experiments
-    if 'failure' in all_data.columns:
-        all_data = all_data[~all_data['failure'].fillna(False)]
-    
     # Create figure
     fig, ax = plt.subplots(figsize=(12, 8))
     
@@ -278,22 +416,25 @@ def create_normalized_scaling_plot():
     fastest_profile = network_profiles[0]  # Assuming sorted by speed
     
     profile_data = all_data[all_data['networkProfile'] == fastest_profile]
+    node_nums = profile_data['nodeNum'].to_numpy()
+    percentages = profile_data['byzantinePercentage'].to_numpy()
+    
+    # Calculate normalized consensus time (time per node) for the whole profile at once
+    time_per_node = profile_data['meanTime'].to_numpy() / node_nums
+    node_order = np.argsort(node_nums, kind='stable')
     
     for i, percentage in enumerate(byzantine_percentages):
-        percentage_data = profile_data[profile_data['byzantinePercentage'] == percentage].sort_values('nodeNum')
+        rows = node_order[percentages[node_order] == percentage]
         
         # Skip if no data for this percentage
-        if len(percentage_data) == 0:
+        if len(rows) == 0:
             continue
         
-        # Calculate normalized consensus time (time per node)
-        percentage_data['time_per_node'] = percentage_data['meanTime'] / percentage_data['nodeNum']
-        
         # Plot
         label = f"Byzantine nodes: {percentage}%"
         ax.plot(
-            percentage_data['nodeNum'],
-            percentage_data['time_per_node'],
+            node_nums[rows],
+            time_per_node[rows],
             marker=markers[i % len(markers)],
             markersize=8,
             linewidth=2,
@@ -304,7 +445,7 @@ def create_normalized_scaling_plot():
     x_vals = np.linspace(4, all_data['nodeNum'].max(), 100)
     
     # Find a good scaling factor for reference lines
-    scaling_factor = profile_data['time_per_node'].median() / profile_data['nodeNum'].median()
+    scaling_factor = np.nanmedian(time_per_node) / np.median(node_nums)  # Skip rows without a mean time
     
     # O(1) - constant time per node
     ax.plot(x_vals, np.ones_like(x_vals) * scaling_factor * 10, 'k:', linewidth=1.5, alpha=0.5, label="O(1) scaling")
@@ -331,26 +472,19 @@ def create_normalized_scaling_plot():
     
     # Save figure
     plt.tight_layout()
-    plt.savefig(os.path.join(OUTPUT_DIR, 'normalized_scaling.png'), dpi=300, bbox_inches='tight')
+    plt.savefig(os.path.join(OUTPUT_DIR, 'normalized_scaling.png'), dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_PIL_KWARGS)
     plt.close()
     
     print("✓ Normalized scaling plot generated")
 
 # Create 3D visualization of network delay vs nodes vs Byzantine ratio
-def create_3d_visualization():
+def create_3d_visualization(all_data):
     print("Generating 3D visualization...")
     
-    # Load all experiment data
-    all_data = load_data('all-experiments.csv')
-    
     if all_data is None:
         print("No experiment data found!")
         return
     
-    # Filter out failed experiments
-    if 'failure' in all_data.columns:
-        all_data = all_data[~all_data['failure'].fillna(False)]
-    
     # Create figure
     fig = plt.figure(figsize=(15, 10))
     ax = fig.add_subplot(111, projection='3d')
@@ -365,38 +499,33 @@ def create_3d_visualization():
     byzantine_percentages = sorted(all_data['byzantinePercentage'].unique())
     markers = ['o', 's', '^', 'D']
     
-    # Create a surface plot
-    for i, profile in enumerate(network_profiles):
-        profile_data = all_data[all_data['networkProfile'] == profile]
+    # Per-row coordinates, color index (by profile) and marker index (by percentage)
+    xs = all_data['nodeNum'].to_numpy()
+    ys = all_data['byzantinePercentage'].to_numpy()
+    zs = all_data['meanTime'].to_numpy()
+    color_idx = pd.Categorical(all_data['networkProfile'], categories=network_profiles).codes % len(profile_colors)
+    marker_idx = np.searchsorted(byzantine_percentages, ys) % len(markers)
+    point_colors = np.array(profile_colors)[color_idx]
+    
+    # Plot 3D scatter, one call per marker style
+    for k, marker in enumerate(markers):
+        mask = marker_idx == k
+        if not mask.any():
+            continue
+        ax.scatter(xs[mask], ys[mask], zs[mask], c=point_colors[mask], marker=marker, s=100, alpha=0.7)
+    
+    # Connect points with lines, one (network profile, Byzantine percentage) group at a time
+    profile_index = {profile: i for i, profile in enumerate(network_profiles)}
+    for (profile, percentage), percentage_data in group_by_profile_and_percentage(all_data):
+        i = profile_index[profile]
         
-        # For each Byzantine percentage
-        for j, percentage in enumerate(byzantine_percentages):
-            percentage_data = profile_data[profile_data['byzantinePercentage'] == percentage].sort_values('nodeNum')
-            
-            # Skip if no data for this combination
-            if len(percentage_data) == 0:
-                continue
-            
-            # Plot 3D scatter
-            ax.scatter(
-                percentage_data['nodeNum'],
-                percentage_data['byzantinePercentage'],
-                percentage_data['meanTime'],
-                color=profile_colors[i % len(profile_colors)],
-                marker=markers[j % len(markers)],
-                s=100,
-                alpha=0.7,
-                label=f"{profile}, {percentage}% Byzantine" if j == 0 else ""
-            )
-            
-            # Connect points with lines
-            ax.plot(
-                percentage_data['nodeNum'],
-                percentage_data['byzantinePercentage'],
-                percentage_data['meanTime'],
-                color=profile_colors[i % len(profile_colors)],
-                alpha=0.4
-            )
+        ax.plot(
+            percentage_data['nodeNum'],
+            percentage_data['byzantinePercentage'],
+            percentage_data['meanTime'],
+            color=profile_colors[i % len(profile_colors)],
+            alpha=0.4
+        )
     
     # Set axis labels
     ax.set_xlabel('Total Number of Nodes', fontsize=12)
@@ -409,52 +538,53 @@ def create_3d_visualization():
     # Adjust view angle for better visualization
     ax.view_init(elev=30, azim=45)
     
-    # Add legend
-    ax.legend(loc='upper left', frameon=True)
+    # Add legend with one entry per network profile
+    legend_handles = [
+        Line2D([], [], color=profile_colors[i % len(profile_colors)], marker=markers[0],
+               linestyle='none', markersize=10, alpha=0.7,
+               label=f"{profile}, {byzantine_percentages[0]}% Byzantine")
+        for i, profile in enumerate(network_profiles)
+    ]
+    ax.legend(handles=legend_handles, loc='upper left', frameon=True)
     
     # Save figure
     plt.tight_layout()
-    plt.savefig(os.path.join(OUTPUT_DIR, '3d_visualization.png'), dpi=300, bbox_inches='tight')
+    plt.savefig(os.path.join(OUTPUT_DIR, '3d_visualization.png'), dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_PIL_KWARGS)
     plt.close()
     
     print("✓ 3D visualization generated")
 
 # Create heatmap of node count vs Byzantine percentage for each network profile
-def create_heatmaps():
+def create_heatmaps(all_data, mean_time_table):
     print("Generating heatmaps...")
     
-    # Load all experiment data
-    all_data = load_data('all-experiments.csv')
-    
     if all_data is None:
         print("No experiment data found!")
         return
     
-    # Filter out failed experiments
-    if 'failure' in all_data.columns:
-        all_data = all_data[~all_data['failure'].fillna(False)]
-    
     # Get unique network profiles
     network_profiles = sorted(all_data['networkProfile'].unique())
     
+    # First row of each profile, used for the network delay parameters
+    profile_info = all_data.drop_duplicates('networkProfile').set_index('networkProfile')
+    
+    # Create one figure with a dedicated colorbar axes, reused for every profile
+    fig, (ax, cbar_ax) = plt.subplots(1, 2, figsize=(10, 8), gridspec_kw={'width_ratios': [20, 1]})
+    
     # Create a heatmap for each network profile
     for profile in network_profiles:
-        profile_data = all_data[all_data['networkProfile'] == profile]
+        # Slice out this profile's (node count x Byzantine percentage) table
+        pivot = mean_time_table.loc[profile].dropna(axis=1, how='all')
         
-        # Create pivot table
-        pivot = profile_data.pivot_table(
-            index='nodeNum',
-            columns='byzantinePercentage',
-            values='meanTime',
-            aggfunc='mean'
-        )
-        
-        # Create figure
-        plt.figure(figsize=(10, 8))
+        # Reset the axes from the previous profile
+        ax.clear()
+        cbar_ax.clear()
         
         # Plot heatmap
         sns.heatmap(
             pivot,
+            ax=ax,
+            cbar_ax=cbar_ax,
             annot=True,
             fmt=".0f",
             cmap=custom_cmap,
@@ -463,35 +593,29 @@ def create_heatmaps():
         )
         
         # Set title and labels
-        mean_delay = profile_data['networkMean'].iloc[0] if 'networkMean' in profile_data.columns else 'Unknown'
-        std_delay = profile_data['networkStd'].iloc[0] if 'networkStd' in profile_data.columns else 'Unknown'
+        mean_delay = profile_info.at[profile, 'networkMean'] if 'networkMean' in profile_info.columns else 'Unknown'
+        std_delay = profile_info.at[profile, 'networkStd'] if 'networkStd' in profile_info.columns else 'Unknown'
         
-        plt.title(f'Heatmap: Node Count vs. Byzantine Percentage\nNetwork: {profile} (Mean={mean_delay}s, Std={std_delay}s)', fontsize=14)
-        plt.xlabel('Byzantine Nodes (%)', fontsize=12)
-        plt.ylabel('Total Number of Nodes', fontsize=12)
+        ax.set_title(f'Heatmap: Node Count vs. Byzantine Percentage\nNetwork: {profile} (Mean={mean_delay}s, Std={std_delay}s)', fontsize=14)
+        ax.set_xlabel('Byzantine Nodes (%)', fontsize=12)
+        ax.set_ylabel('Total Number of Nodes', fontsize=12)
         
         # Save figure
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, f'{profile}_heatmap.png'), dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(os.path.join(OUTPUT_DIR, f'{profile}_heatmap.png'), dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_PIL_KWARGS)
+    
+    plt.close(fig)
     
     print("✓ Heatmaps generated")
 
 # Create comprehensive visualization with multiple subplots
-def create_comprehensive_visualization():
+def create_comprehensive_visualization(all_data):
     print("Generating comprehensive visualization...")
     
-    # Load all experiment data
-    all_data = load_data('all-experiments.csv')
-    
     if all_data is None:
         print("No experiment data found!")
         return
     
-    # Filter out failed experiments
-    if 'failure' in all_data.columns:
-        all_data = all_data[~all_data['failure'].fillna(False)]
-    
     # Get unique network profiles and Byzantine percentages
     network_profiles = sorted(all_data['networkProfile'].unique())
     byzantine_percentages = sorted(all_data['byzantinePercentage'].unique())
@@ -500,47 +624,57 @@ def create_comprehensive_visualization():
     fig = plt.figure(figsize=(20, 15))
     gs = fig.add_gridspec(len(network_profiles), len(byzantine_percentages))
     
+    axes = [[fig.add_subplot(gs[i, j]) for j in range(len(byzantine_percentages))]
+            for i in range(len(network_profiles))]
+    
+    # Map each profile and percentage to its grid position
+    profile_index = {profile: i for i, profile in enumerate(network_profiles)}
+    percentage_index = {percentage: j for j, percentage in enumerate(byzantine_percentages)}
+    
+    # Shared y-axis limit for all subplots
+    max_time = float(all_data['meanTime'].max()) * 1.1
+    
     # Plot each network profile vs Byzantine percentage combination
-    for i, profile in enumerate(network_profiles):
-        profile_data = all_data[all_data['networkProfile'] == profile]
+    plotted = set()
+    for (profile, percentage), percentage_data in group_by_profile_and_percentage(all_data):
+        i = profile_index[profile]
+        j = percentage_index[percentage]
+        ax = axes[i][j]
+        plotted.add((i, j))
         
-        for j, percentage in enumerate(byzantine_percentages):
-            ax = fig.add_subplot(gs[i, j])
-            
-            percentage_data = profile_data[profile_data['byzantinePercentage'] == percentage].sort_values('nodeNum')
-            
-            # Skip if no data for this combination
-            if len(percentage_data) == 0:
-                ax.text(0.5, 0.5, 'No Data', ha='center', va='center')
-                continue
-            
-            # Plot line with error bars
-            ax.errorbar(
-                percentage_data['nodeNum'],
-                percentage_data['meanTime'],
-                yerr=percentage_data['stdTime'],
-                marker='o',
-                markersize=6,
-                linewidth=2,
-                capsize=3
-            )
-            
-            # Set subplot title
-            ax.set_title(f'{profile}, {percentage}% Byzantine', fontsize=10)
-            
-            # Only show y-axis labels on the leftmost column
-            if j == 0:
-                ax.set_ylabel('Consensus Time (ms)', fontsize=10)
-            
-            # Only show x-axis labels on the bottom row
-            if i == len(network_profiles)-1:
-                ax.set_xlabel('Nodes', fontsize=10)
-            
-            # Apply grid
-            ax.grid(True, alpha=0.3)
-            
-            # Scale y-axis consistently across all subplots
-            ax.set_ylim(0, all_data['meanTime'].max() * 1.1)
+        # Plot line with error bars
+        ax.errorbar(
+            percentage_data['nodeNum'],
+            percentage_data['meanTime'],
+            yerr=percentage_data['stdTime'],
+            marker='o',
+            markersize=6,
+            linewidth=2,
+            capsize=3
+        )
+        
+        # Set subplot title
+        ax.set_title(f'{profile}, {percentage}% Byzantine', fontsize=10)
+        
+        # Only show y-axis labels on the leftmost column
+        if j == 0:
+            ax.set_ylabel('Consensus Time (ms)', fontsize=10)
+        
+        # Only show x-axis labels on the bottom row
+        if i == len(network_profiles)-1:
+            ax.set_xlabel('Nodes', fontsize=10)
+        
+        # Apply grid
+        ax.grid(True, alpha=0.3)
+        
+        # Scale y-axis consistently across all subplots
+        ax.set_ylim(0, max_time)
+    
+    # Mark combinations without any data
+    for i in range(len(network_profiles)):
+        for j in range(len(byzantine_percentages)):
+            if (i, j) not in plotted:
+                axes[i][j].text(0.5, 0.5, 'No Data', ha='center', va='center')
     
     # Add a common title
     fig.suptitle('Comprehensive View: Consensus Time Across All Configurations', fontsize=16)
@@ -549,7 +683,7 @@ def create_comprehensive_visualization():
     plt.tight_layout(rect=[0, 0, 1, 0.97])
     
     # Save figure
-    plt.savefig(os.path.join(OUTPUT_DIR, 'comprehensive_visualization.png'), dpi=300, bbox_inches='tight')
+    plt.savefig(os.path.join(OUTPUT_DIR, 'comprehensive_visualization.png'), dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_PIL_KWARGS)
     plt.close()
     
     print("✓ Comprehensive visualization generated")
@@ -562,13 +696,23 @@ def main():
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
     
+    # Load the combined experiment data once and share it across visualizations
+    all_data = load_all_experiments()
+    
+    # Aggregate it once per configuration; the combined visualizations all work from this summary
+    summary = None
+    mean_time_table = None
+    if all_data is not None:
+        summary = aggregate_experiments(all_data)
+        mean_time_table = pivot_mean_time(summary)
+    
     # Generate all visualizations
-    create_byzantine_impact_plots()
-    create_combined_visualization()
-    create_normalized_scaling_plot()
-    create_3d_visualization()
-    create_heatmaps()
-    create_comprehensive_visualization()
+    create_byzantine_impact_plots(all_data)
+    create_combined_visualization(summary)
+    create_normalized_scaling_plot(summary)
+    create_3d_visualization(summary)
+    create_heatmaps(summary, mean_time_table)
+    create_comprehensive_visualization(summary)
     
     print("\nAll visualizations complete! Output saved to:", OUTPUT_DIR)
 